@@ -11,6 +11,11 @@ import yaml
 
 from .version_comparator import VersionComparator
 
+try:
+    from yaml import CSafeLoader as YamlSafeLoader
+except ImportError:
+    from yaml import SafeLoader as YamlSafeLoader
+
 
 class PluginStatus(str, Enum):
     INSTALLED = "installed"
@@ -96,7 +101,10 @@ def load_yaml_metadata(plugin_dir: Path) -> dict:
     yaml_path = plugin_dir / "metadata.yaml"
     if yaml_path.exists():
         try:
-            return yaml.safe_load(yaml_path.read_text(encoding="utf-8")) or {}
+            return (
+                yaml.load(yaml_path.read_text(encoding="utf-8"), Loader=YamlSafeLoader)
+                or {}
+            )
         except Exception as e:
             click.echo(f"Failed to read {yaml_path}: {e}", err=True)
     return {}
@@ -0,0 +1,432 @@
+from __future__ import annotations
+
+import importlib.util
+import json
+import os
+import sys
+from pathlib import Path
+
+import httpx
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+SCRIPT_PATH = REPO_ROOT / "插件源JSON生成.py"
+
+
+def load_script_module():
+    module_name = "plugin_registry_script"
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+    spec = importlib.util.spec_from_file_location(module_name, SCRIPT_PATH)
+    assert spec and spec.loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+script = load_script_module()
+
+
+def write_plugin(plugin_dir: Path, dir_name: str, version: str, **extra) -> Path:
+    plugin_path = plugin_dir / dir_name
+    plugin_path.mkdir(parents=True, exist_ok=True)
+    lines = [
+        f"name: {dir_name}",
+        "desc: test plugin",
+        f"version: {version}",
+        "author: tester",
+    ]
+    lines.extend(f"{key}: {value}" for key, value in extra.items())
+    metadata_path = plugin_path / "metadata.yaml"
+    metadata_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return metadata_path
+
+
+def bump_mtime(path: Path) -> None:
+    # 部分文件系统的时间精度较粗，显式修改 mtime 以保证与上次记录不同
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def run_main(monkeypatch, plugin_dir: Path, output_path: Path, *extra: str) -> None:
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        [
+            "插件源JSON生成.py",
+            "--plugin-dir",
+            str(plugin_dir),
+            "--output",
+            str(output_path),
+            *extra,
+        ],
+    )
+    script.main()
+
+
+def use_mock_github(monkeypatch, handler, headers: dict | None = None) -> None:
+    monkeypatch.setattr(
+        script,
+        "create_async_github_client",
+        lambda: httpx.AsyncClient(
+            transport=httpx.MockTransport(handler),
+            headers=headers,
+        ),
+    )
+
+
+def read_registry(output_path: Path) -> dict:
+    return json.loads(output_path.read_text(encoding="utf-8"))
+
+
+def test_interrupted_run_does_not_persist_mtimes(monkeypatch, tmp_path: Path):
+    plugin_dir = tmp_path / "plugins"
+    output_path = tmp_path / "out" / "plugins.json"
+    metadata_path = write_plugin(plugin_dir, "plugin_a", "1.0.0")
+
+    run_main(monkeypatch, plugin_dir, output_path)
+    assert read_registry(output_path)["plugin_a"]["version"] == "1.0.0"
+
+    write_plugin(plugin_dir, "plugin_a", "1.1.0")
+    bump_mtime(metadata_path)
+
+    async def interrupted(registry, cache_dir):
+        raise RuntimeError("interrupted")
+
+    with monkeypatch.context() as m:
+        m.setattr(script, "update_registry_from_github", interrupted)
+        with pytest.raises(RuntimeError):
+            run_main(m, plugin_dir, output_path)
+
+    # 中断的运行既未写入注册表，也不能让修改时间缓存记录新的 mtime
+    assert read_registry(output_path)["plugin_a"]["version"] == "1.0.0"
+
+    run_main(monkeypatch, plugin_dir, output_path)
+    assert read_registry(output_path)["plugin_a"]["version"] == "1.1.0"
+
+
+def test_unchanged_metadata_reuses_previous_entry(tmp_path: Path):
+    plugin_dir = tmp_path / "plugins"
+    write_plugin(plugin_dir, "plugin_a", "1.0.0")
+
+    registry, mtimes = script.collect_installed_plugins(plugin_dir)
+    assert registry["plugin_a"].version == "1.0.0"
+    assert mtimes["plugin_a"]["name"] == "plugin_a"
+
+    previous = {"plugin_a": {**script.asdict(registry["plugin_a"]), "desc": "cached"}}
+    reused, _ = script.collect_installed_plugins(
+        plugin_dir,
+        previous=previous,
+        mtimes=mtimes,
+    )
+    assert reused["plugin_a"].desc == "cached"
+
+    # 不传入修改时间缓存时总是重新解析 metadata.yaml
+    reparsed, _ = script.collect_installed_plugins(plugin_dir, previous=previous)
+    assert reparsed["plugin_a"].desc == "test plugin"
+
+
+def test_registry_md5_matches_written_bytes(monkeypatch, tmp_path: Path):
+    plugin_dir = tmp_path / "plugins"
+    output_path = tmp_path / "out" / "plugins.json"
+    write_plugin(plugin_dir, "plugin_a", "1.0.0", display_name="插件 A")
+
+    run_main(monkeypatch, plugin_dir, output_path)
+
+    payload = output_path.read_bytes()
+    md5_path = output_path.with_name("plugins-md5.json")
+    expected_md5 = script.hashlib.md5(payload, usedforsecurity=False).hexdigest()
+    assert json.loads(md5_path.read_text(encoding="utf-8")) == {"md5": expected_md5}
+
+    # orjson 与标准库 json 的序列化结果一致，安装与否不影响摘要
+    registry = read_registry(output_path)
+    monkeypatch.setattr(script, "orjson", None)
+    assert script.serialize_registry(registry) == payload
+
+
+def test_unchanged_registry_is_not_rewritten(monkeypatch, tmp_path: Path):
+    plugin_dir = tmp_path / "plugins"
+    output_path = tmp_path / "out" / "plugins.json"
+    write_plugin(plugin_dir, "plugin_a", "1.0.0")
+
+    run_main(monkeypatch, plugin_dir, output_path)
+    first_stat = output_path.stat()
+
+    writes: list[Path] = []
+    original_write = script.write_bytes_atomic
+
+    def recording_write(payload: bytes, path: Path) -> None:
+        writes.append(path)
+        original_write(payload, path)
+
+    monkeypatch.setattr(script, "write_bytes_atomic", recording_write)
+    run_main(monkeypatch, plugin_dir, output_path)
+
+    assert output_path not in writes
+    assert output_path.stat().st_mtime_ns == first_stat.st_mtime_ns
+
+
+def test_gzip_is_created_when_registry_is_unchanged(monkeypatch, tmp_path: Path):
+    plugin_dir = tmp_path / "plugins"
+    output_path = tmp_path / "out" / "plugins.json"
+    gzip_path = output_path.with_name("plugins.json.gz")
+    write_plugin(plugin_dir, "plugin_a", "1.0.0")
+
+    run_main(monkeypatch, plugin_dir, output_path)
+    assert not gzip_path.exists()
+
+    # 注册表未变化时首次指定 --gzip，仍应补充生成压缩文件
+    run_main(monkeypatch, plugin_dir, output_path, "--gzip")
+    assert script.gzip.decompress(gzip_path.read_bytes()) == output_path.read_bytes()
+
+    gzip_path.unlink()
+    run_main(monkeypatch, plugin_dir, output_path, "--gzip")
+    assert script.gzip.decompress(gzip_path.read_bytes()) == output_path.read_bytes()
+
+
+def test_failed_write_removes_tmp_file(monkeypatch, tmp_path: Path):
+    output_path = tmp_path / "plugins.json.gz"
+    output_path.write_bytes(b"old")
+
+    def failing_replace(src, dst):
+        raise OSError("replace failed")
+
+    monkeypatch.setattr(script.os, "replace", failing_replace)
+    with pytest.raises(OSError):
+        script.write_bytes_atomic(b"new", output_path)
+
+    assert output_path.read_bytes() == b"old"
+    assert list(tmp_path.iterdir()) == [output_path]
+
+
+@pytest.mark.parametrize(
+    ("repo_url", "expected"),
+    [
+        ("https://github.com/owner/repo", ("owner", "repo")),
+        ("http://github.com/owner/repo", ("owner", "repo")),
+        ("https://github.com/owner/repo.git", ("owner", "repo")),
+        ("https://github.com/owner/repo/tree/main", ("owner", "repo")),
+        ("https://github.com/owner/repo?tab=readme", ("owner", "repo")),
+        ("  https://github.com/owner/repo/  ", ("owner", "repo")),
+        ("git@github.com:owner/repo.git", ("owner", "repo")),
+        ("git@github.com:owner/repo", ("owner", "repo")),
+        ("github.com/owner/repo", ("owner", "repo")),
+        ("https://www.github.com/owner/repo", ("owner", "repo")),
+        ("https://github.com/owner/repo.name", ("owner", "repo.name")),
+    ],
+)
+def test_parse_github_repo_accepts_known_forms(repo_url: str, expected):
+    assert script.parse_github_repo(repo_url) == expected
+
+
+@pytest.mark.parametrize(
+    "repo_url",
+    [
+        "https://github.com:owner/repo",
+        "git@github.com/owner/repo",
+        "https://github.com/a/.git",
+        "https://github.com/owner",
+        "https://gitlab.com/owner/repo",
+        "",
+    ],
+)
+def test_parse_github_repo_rejects_malformed_urls(repo_url: str):
+    assert script.parse_github_repo(repo_url) is None
+
+
+@pytest.mark.asyncio
+async def test_get_with_etag_revalidates_and_evicts():
+    url = "https://api.github.com/repos/owner/repo"
+    responses = [
+        httpx.Response(200, headers={"ETag": '"v1"'}, text="first"),
+        httpx.Response(304),
+        httpx.Response(200, text="no etag"),
+    ]
+    seen_etags: list[str | None] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen_etags.append(request.headers.get("If-None-Match"))
+        return responses.pop(0)
+
+    etag_cache: dict = {}
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        assert await script._get_with_etag(client, url, etag_cache) == "first"
+        assert etag_cache[url] == {"etag": '"v1"', "body": "first"}
+
+        # 304 时复用缓存的响应体
+        assert await script._get_with_etag(client, url, etag_cache) == "first"
+
+        # 200 但未携带 ETag 时，旧缓存不能继续保留
+        assert await script._get_with_etag(client, url, etag_cache) == "no etag"
+        assert url not in etag_cache
+
+    assert seen_etags == [None, '"v1"', '"v1"']
+
+
+@pytest.mark.asyncio
+async def test_etag_cache_drops_repos_no_longer_in_registry(
+    monkeypatch,
+    tmp_path: Path,
+):
+    api_url = "https://api.github.com/repos/owner/repo"
+    raw_url = "https://raw.githubusercontent.com/owner/repo/main/metadata.yaml"
+    stale_urls = [
+        "https://api.github.com/repos/owner/removed",
+        "https://raw.githubusercontent.com/owner/removed/main/metadata.yaml",
+        "https://api.github.com/repos/owner/repo-fork",
+    ]
+    script.save_json(
+        {url: {"etag": '"old"', "body": "{}"} for url in stale_urls},
+        tmp_path / script.ETAG_CACHE_FILE,
+    )
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        url = str(request.url)
+        if url == api_url:
+            return httpx.Response(
+                200,
+                headers={"ETag": '"api"'},
+                json={"default_branch": "main"},
+            )
+        if url == raw_url:
+            return httpx.Response(
+                200,
+                headers={"ETag": '"raw"'},
+                text="version: 2.0.0\n",
+            )
+        return httpx.Response(404)
+
+    use_mock_github(monkeypatch, handler)
+    registry = {
+        "plugin_a": script.PluginEntry(
+            name="plugin_a",
+            desc="test plugin",
+            version="1.0.0",
+            author="tester",
+            repo="https://github.com/owner/repo",
+        ),
+    }
+    await script.update_registry_from_github(registry, tmp_path)
+
+    assert registry["plugin_a"].version == "2.0.0"
+    saved = json.loads((tmp_path / script.ETAG_CACHE_FILE).read_text("utf-8"))
+    assert set(saved) == {api_url, raw_url}
+
+
+def test_branch_cache_expires_after_ttl(tmp_path: Path):
+    cache_path = tmp_path / script.BRANCH_CACHE_FILE
+    now = script.time.time()
+    script.save_json(
+        {
+            "owner/fresh": {"branch": "dev", "cached_at": now},
+            "owner/expired": {
+                "branch": "dev",
+                "cached_at": now - script.BRANCH_CACHE_TTL - 1,
+            },
+            "owner/broken": {"branch": "dev"},
+        },
+        cache_path,
+    )
+
+    assert set(script.load_branch_cache(cache_path)) == {"owner/fresh"}
+
+
+@pytest.mark.asyncio
+async def test_cached_branch_skips_default_branch_probe():
+    requests: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(str(request.url))
+        return httpx.Response(200, text="version: 1.2.0\n")
+
+    branch_cache = {"owner/repo": {"branch": "dev", "cached_at": 0.0}}
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        data = await script.fetch_remote_metadata(
+            client,
+            "owner",
+            "repo",
+            {},
+            branch_cache,
+        )
+
+    assert data == {"version": "1.2.0"}
+    assert requests == [
+        "https://raw.githubusercontent.com/owner/repo/dev/metadata.yaml",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_stale_cached_branch_is_invalidated():
+    requests: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        url = str(request.url)
+        requests.append(url)
+        if url == "https://api.github.com/repos/owner/repo":
+            return httpx.Response(200, json={"default_branch": "trunk"})
+        if url.endswith("/trunk/metadata.yaml"):
+            return httpx.Response(200, text="version: 1.3.0\n")
+        return httpx.Response(404)
+
+    branch_cache = {"owner/repo": {"branch": "dev", "cached_at": 0.0}}
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        data = await script.fetch_remote_metadata(
+            client,
+            "owner",
+            "repo",
+            {},
+            branch_cache,
+        )
+
+    assert data == {"version": "1.3.0"}
+    assert branch_cache["owner/repo"]["branch"] == "trunk"
+    assert branch_cache["owner/repo"]["cached_at"] > 0
+    assert requests == [
+        "https://raw.githubusercontent.com/owner/repo/dev/metadata.yaml",
+        "https://api.github.com/repos/owner/repo",
+        "https://raw.githubusercontent.com/owner/repo/trunk/metadata.yaml",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_graphql_misses_fall_back_to_rest(monkeypatch, tmp_path: Path):
+    requests: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        url = str(request.url)
+        requests.append(url)
+        if url == script.GITHUB_GRAPHQL_URL:
+            # 仓库 b 的 metadata.yaml 不在默认分支上，对应别名返回 null
+            return httpx.Response(
+                200,
+                json={
+                    "data": {
+                        "repo0": {"object": {"text": "version: 2.0.0\n"}},
+                        "repo1": {"object": None},
+                    },
+                },
+            )
+        if url == "https://api.github.com/repos/owner/b":
+            return httpx.Response(200, json={"default_branch": "main"})
+        if url == "https://raw.githubusercontent.com/owner/b/main/metadata.yaml":
+            return httpx.Response(200, text="version: 3.0.0\n")
+        return httpx.Response(404)
+
+    use_mock_github(monkeypatch, handler, headers={"Authorization": "token test"})
+    registry = {
+        name: script.PluginEntry(
+            name=name,
+            desc="test plugin",
+            version="1.0.0",
+            author="tester",
+            repo=f"https://github.com/owner/{repo}",
+        )
+        for name, repo in (("plugin_a", "a"), ("plugin_b", "b"))
+    }
+    await script.update_registry_from_github(registry, tmp_path)
+
+    assert registry["plugin_a"].version == "2.0.0"
+    assert registry["plugin_b"].version == "3.0.0"
+    # 仓库 a 已由 GraphQL 读取，不再逐个请求 REST 接口
+    assert not any("/owner/a" in url for url in requests)
@@ -17,6 +17,16 @@
         },
         ...
     }
+- 同时生成与注册表同名的 MD5 文件（如 plugins.json -> plugins-md5.json），
+  内容为 {"md5": "..."}，供 AstrBot 判断本地插件市场缓存是否过期。
+
+依赖说明：
+- YAML 解析优先使用 LibYAML 提供的 C 加速解析器（yaml.CSafeLoader）。
+  需在安装 PyYAML 前安装 libyaml（如 apt install libyaml-dev），
+  否则自动回退到较慢的纯 Python 解析器。
+- 安装 httpx 的 http2 扩展（pip install "httpx[http2]"）后，
+  访问 GitHub 时使用 HTTP/2 在同一连接上复用并发请求，未安装时使用 HTTP/1.1。
+- 安装 orjson 后使用其序列化注册表，未安装时使用标准库 json。
 
 使用方式示例：
 1. 在 AstrBot 根目录执行（自动使用 data/plugins）：
@@ -29,11 +39,21 @@
 3. 指定插件目录（如果你有单独的插件集合）：
     python tools/generate_plugin_registry.py \
         --plugin-dir /path/to/your/plugins
+
+4. 额外生成 gzip 压缩的注册表（如 plugins.json.gz）：
+    python tools/generate_plugin_registry.py --gzip
 """
 
 import argparse
+import asyncio
+import gzip
+import hashlib
 import json
 import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field, fields
 from pathlib import Path
 from typing import Any, Dict, Tuple
 from urllib.parse import urlparse
@@ -44,53 +64,177 @@ import yaml
 from astrbot.cli.utils.plugin import load_yaml_metadata
 from astrbot.core.utils.astrbot_path import get_astrbot_plugin_path
 
+# 优先使用 LibYAML 的 C 解析器，PyYAML 未编译 LibYAML 时回退到纯 Python 实现
+try:
+    from yaml import CSafeLoader as YamlSafeLoader
+except ImportError:
+    from yaml import SafeLoader as YamlSafeLoader
+
+# HTTP/2 依赖 h2 库，未安装时回退到 HTTP/1.1
+try:
+    import h2  # type: ignore # noqa: F401
+
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+try:
+    import orjson  # type: ignore
+except ImportError:
+    orjson = None
+
 # 默认配置变量，便于根据实际环境调整
 # 生成的插件市场 JSON 默认输出到 App-Store/admin/plugins.json
 DEFAULT_REGISTRY_OUTPUT: str = "App-Store/admin/plugins.json"
 
 # GitHub 相关配置
 GITHUB_API_BASE: str = "https://api.github.com"
+GITHUB_GRAPHQL_URL: str = "https://api.github.com/graphql"
 GITHUB_RAW_BASE: str = "https://raw.githubusercontent.com"
 GITHUB_HTTP_TIMEOUT: float = 20.0
+# 同时向 GitHub 发起的最大请求数
+GITHUB_CONCURRENCY: int = 16
+# HTTP 连接池大小，需不小于 GITHUB_CONCURRENCY 以免请求排队等待连接
+GITHUB_MAX_CONNECTIONS: int = 32
+# 单次 GraphQL 请求中合并查询的仓库数量
+GITHUB_GRAPHQL_BATCH_SIZE: int = 50
+
+# ETag 缓存文件名，与注册表 JSON 位于同一目录
+# 结构为 {url: {"etag": str, "body": str}}，用于发起条件请求，未变更时 GitHub 返回 304
+ETAG_CACHE_FILE: str = "etag_cache.json"
+# 本地 metadata.yaml 修改时间缓存文件名，与注册表 JSON 位于同一目录
+# 结构为 {插件目录名: {"mtime_ns": int, "name": 插件 name}}，文件未修改时直接复用上次的注册表条目
+MTIME_CACHE_FILE: str = "mtimes.json"
+# 仓库分支缓存文件名，与注册表 JSON 位于同一目录
+# 结构为 {"owner/repo": {"branch": str, "cached_at": float}}，记录上次成功读取 metadata.yaml 的分支
+BRANCH_CACHE_FILE: str = "branch_cache.json"
+# 分支缓存有效期（秒），过期后重新查询仓库默认分支
+BRANCH_CACHE_TTL: float = 7 * 24 * 3600
 
 # GitHub 访问令牌配置：
 # 1. 优先使用此变量配置的令牌（如不需要可保持为空字符串）
 # 2. 若此变量为空，则依次从环境变量中读取 GITHUB_TOKEN、GH_TOKEN
 GITHUB_ACCESS_TOKEN: str = ""
 GITHUB_TOKEN_ENV_KEYS: tuple[str, ...] = ("GITHUB_TOKEN", "GH_TOKEN")
+# 模块加载时按上述优先级解析一次令牌
+_GITHUB_TOKEN: str = GITHUB_ACCESS_TOKEN or next(
+    (os.environ[key] for key in GITHUB_TOKEN_ENV_KEYS if os.environ.get(key)),
+    "",
+)
+
+# 匹配常见的 GitHub 仓库地址：https://github.com/owner/repo[.git][/...]、
+# git@github.com:owner/repo.git 以及省略协议的 github.com/owner/repo。
+# 前缀与分隔符成对匹配（https 只接受 /，ssh 只接受 :），仓库名不能为空（排除 owner/.git）
+_GITHUB_URL_RE = re.compile(
+    r"^(?:https?://github\.com/|git@github\.com:|github\.com/)"
+    r"([^/?#]+)/(?!\.git(?:[/?#]|$))([^/?#]+?)(?:\.git)?(?:[/?#]|$)",
+)
 
+# 纳入注册表的插件必须提供的 metadata.yaml 字段
+REQUIRED_METADATA_FIELDS: tuple[str, ...] = ("name", "desc", "version", "author")
 
-def create_github_client() -> httpx.Client:
+# 并发读取本地 metadata.yaml 的最大线程数
+METADATA_LOAD_WORKERS: int = 16
+
+
+def create_async_github_client() -> httpx.AsyncClient:
     """
-    创建访问 GitHub 所需的 HTTP 客户端。
+    创建访问 GitHub 所需的异步 HTTP 客户端。
 
-    优先使用 GITHUB_ACCESS_TOKEN，其次尝试从环境变量中读取令牌。
+    优先使用 GITHUB_ACCESS_TOKEN，其次尝试从环境变量中读取令牌（模块加载时解析为 _GITHUB_TOKEN）。
+    已安装 h2 时启用 HTTP/2，使并发请求复用同一个 TCP/TLS 连接。
     """
     headers = {
         "Accept": "application/vnd.github+json",
         "User-Agent": "AstrBot-Plugin-Registry-Generator",
     }
 
-    token = GITHUB_ACCESS_TOKEN
-    if not token:
-        for env_key in GITHUB_TOKEN_ENV_KEYS:
-            env_val = os.environ.get(env_key)
-            if env_val:
-                token = env_val
-                break
-
-    if token:
-        headers["Authorization"] = f"Bearer {token}"
+    if _GITHUB_TOKEN:
+        headers["Authorization"] = f"Bearer {_GITHUB_TOKEN}"
 
-    client = httpx.Client(
+    client = httpx.AsyncClient(
         headers=headers,
         follow_redirects=True,
         timeout=GITHUB_HTTP_TIMEOUT,
+        http2=HTTP2_AVAILABLE,
+        limits=httpx.Limits(
+            max_connections=GITHUB_MAX_CONNECTIONS,
+            max_keepalive_connections=GITHUB_MAX_CONNECTIONS,
+        ),
     )
     return client
 
 
-def collect_installed_plugins(plugin_dir: Path) -> Dict[str, Dict[str, Any]]:
+@dataclass(slots=True)
+class PluginEntry:
+    """
+    插件注册表中的单个插件条目，字段与官方插件市场格式一致。
+
+    Attributes:
+        name: 插件名称，同时作为注册表的顶层键。
+        desc: 插件描述。
+        version: 插件版本。
+        author: 插件作者。
+        repo: 插件仓库地址，用于在线更新。
+        display_name: 展示名称，缺省时前端会使用 name。
+        social_link: 作者社交链接。
+        tags: 标签列表。
+        logo: 插件图标地址。
+        pinned: 是否置顶。
+        stars: Star 数量。
+        updated_at: 更新时间。
+    """
+
+    name: str
+    desc: str
+    version: str
+    author: str
+    repo: str = ""
+    display_name: str = ""
+    social_link: str = ""
+    tags: list[str] = field(default_factory=list)
+    logo: str = ""
+    pinned: bool = False
+    stars: int = 0
+    updated_at: str = ""
+
+
+PLUGIN_ENTRY_FIELDS: tuple[str, ...] = tuple(f.name for f in fields(PluginEntry))
+
+
+def load_mtime_cache(cache_path: Path) -> Dict[str, Dict[str, Any]]:
+    """
+    加载本地 metadata.yaml 修改时间缓存文件。
+
+    Args:
+        cache_path: 缓存文件路径。
+
+    Returns:
+        Dict[str, Dict[str, Any]]: 插件目录名到 {"mtime_ns", "name"} 的映射，读取失败返回空字典。
+    """
+    if not cache_path.exists():
+        return {}
+    try:
+        with cache_path.open("r", encoding="utf-8") as f:
+            data = json.load(f)
+    except Exception:
+        return {}
+    if not isinstance(data, dict):
+        return {}
+    return {
+        str(dir_name): item
+        for dir_name, item in data.items()
+        if isinstance(item, dict)
+        and isinstance(item.get("mtime_ns"), int)
+        and isinstance(item.get("name"), str)
+    }
+
+
+def collect_installed_plugins(
+    plugin_dir: Path,
+    previous: Dict[str, Dict[str, Any]] | None = None,
+    mtimes: Dict[str, Dict[str, Any]] | None = None,
+) -> Tuple[Dict[str, PluginEntry], Dict[str, Dict[str, Any]]]:
     """
     收集指定插件目录下的插件元数据，并构建插件注册表字典。
 
@@ -103,7 +247,13 @@ def collect_installed_plugins(plugin_dir: Path) -> Dict[str, Dict[str, Any]]:
         - ...
 
     元数据读取规则：
-    - 使用 AstrBot 已有的 load_yaml_metadata 读取 metadata.yaml。
+    - 使用 AstrBot 已有的 load_yaml_metadata 读取 metadata.yaml，
+      多个插件目录通过线程池并发读取。
+    - metadata.yaml 修改时间与 mtimes 中记录的一致、且 previous 中
+      存在对应条目的插件直接复用该条目，不再解析 YAML。
+    - 本次扫描得到的修改时间随结果一并返回，不在此处写入缓存文件：
+      调用方应在注册表写入完成后再保存，避免中途失败时缓存记录了
+      未写入注册表的修改时间，导致后续运行一直复用旧条目。
     - 只处理包含 name、desc/description、version、author 的插件。
     - 如果存在 repo 字段，则写入注册表，以支持在线更新。
     - display_name、tags 等扩展字段会尽量从 metadata.yaml 中读取，
@@ -111,25 +261,61 @@ def collect_installed_plugins(plugin_dir: Path) -> Dict[str, Dict[str, Any]]:
 
     Args:
         plugin_dir: 插件根目录路径（一般为 data/plugins）。
+        previous: 上次生成的注册表，用于复用未修改插件的条目。
+        mtimes: 上次运行保存的修改时间缓存，为 None 时不启用复用。
 
     Returns:
-        Dict[str, Dict[str, Any]]: 插件注册表字典，键为插件 name，值为插件信息。
+        Tuple[Dict[str, PluginEntry], Dict[str, Dict[str, Any]]]:
+            插件注册表字典（键为插件 name，值为插件条目），
+            以及本次扫描得到的插件目录名到 {"mtime_ns", "name"} 的映射。
     """
-    registry: Dict[str, Dict[str, Any]] = {}
+    registry: Dict[str, PluginEntry] = {}
+    new_mtimes: Dict[str, Dict[str, Any]] = {}
 
     if not plugin_dir.exists():
         # 如果插件目录不存在，则返回空字典，交由调用方处理
-        return registry
+        return registry, new_mtimes
 
-    # 遍历插件目录中的所有子目录，每个子目录视为一个插件
-    for sub in plugin_dir.iterdir():
-        if not sub.is_dir():
-            # 非目录（文件等）跳过
+    # 插件目录中的每个子目录视为一个插件，非目录（文件等）跳过；排序以保证输出稳定
+    # os.scandir 的 DirEntry.is_dir() 直接使用目录项中的类型信息，无需逐个 stat
+    with os.scandir(plugin_dir) as it:
+        subs = sorted(Path(entry.path) for entry in it if entry.is_dir())
+
+    previous = previous or {}
+    mtimes = mtimes or {}
+
+    # 先比较 metadata.yaml 的修改时间，未变化的插件直接复用上次的条目
+    to_load: list[Tuple[Path, int]] = []
+    for sub in subs:
+        try:
+            mtime_ns = (sub / "metadata.yaml").stat().st_mtime_ns
+        except OSError:
+            # 没有 metadata.yaml，跳过该插件
             continue
+        cached = mtimes.get(sub.name)
+        if cached and cached["mtime_ns"] == mtime_ns and cached["name"] in previous:
+            previous_entry = previous[cached["name"]]
+            try:
+                registry[cached["name"]] = PluginEntry(
+                    **{
+                        key: previous_entry[key]
+                        for key in PLUGIN_ENTRY_FIELDS
+                        if key in previous_entry
+                    },
+                )
+            except TypeError:
+                # 上次的条目缺少必要字段，重新解析 metadata.yaml
+                to_load.append((sub, mtime_ns))
+                continue
+            new_mtimes[sub.name] = cached
+            continue
+        to_load.append((sub, mtime_ns))
 
-        # 使用 AstrBot 内置工具函数读取 metadata.yaml
-        metadata = load_yaml_metadata(sub)
+    # 读取 metadata.yaml 属于 I/O 密集操作，使用线程池并发执行
+    with ThreadPoolExecutor(max_workers=METADATA_LOAD_WORKERS) as executor:
+        metadatas = list(executor.map(load_yaml_metadata, [sub for sub, _ in to_load]))
 
+    for (sub, mtime_ns), metadata in zip(to_load, metadatas):
         if not metadata:
             # 没有 metadata，跳过该插件
             continue
@@ -139,14 +325,13 @@ def collect_installed_plugins(plugin_dir: Path) -> Dict[str, Dict[str, Any]]:
             metadata["desc"] = metadata["description"]
 
         # 必要字段检查：name / desc / version / author
-        name = str(metadata.get("name", "")).strip()
-        desc = str(metadata.get("desc", "")).strip()
-        version = str(metadata.get("version", "")).strip()
-        author = str(metadata.get("author", "")).strip()
-
-        if not name or not desc or not version or not author:
+        required_values = [
+            str(metadata.get(key) or "").strip() for key in REQUIRED_METADATA_FIELDS
+        ]
+        if not all(required_values):
             # 元数据不完整，不纳入注册表
             continue
+        name, desc, version, author = required_values
 
         # 仓库地址，用于后续在线更新
         repo = str(metadata.get("repo", "") or "").strip()
@@ -173,26 +358,27 @@ def collect_installed_plugins(plugin_dir: Path) -> Dict[str, Dict[str, Any]]:
         updated_at = str(metadata.get("updated_at", "") or "").strip()
 
         # 构建单个插件的注册表条目
-        plugin_entry: Dict[str, Any] = {
-            "name": name,
-            "desc": desc,
-            "version": version,
-            "author": author,
-            "repo": repo,
+        plugin_entry = PluginEntry(
+            name=name,
+            desc=desc,
+            version=version,
+            author=author,
+            repo=repo,
             # 扩展字段
-            "display_name": display_name,
-            "social_link": social_link,
-            "tags": tags,
-            "logo": logo,
-            "pinned": pinned,
-            "stars": stars,
-            "updated_at": updated_at,
-        }
+            display_name=display_name,
+            social_link=social_link,
+            tags=tags,
+            logo=logo,
+            pinned=pinned,
+            stars=stars,
+            updated_at=updated_at,
+        )
 
         # 顶层键使用插件 name，保持与官方格式一致
         registry[name] = plugin_entry
+        new_mtimes[sub.name] = {"mtime_ns": mtime_ns, "name": name}
 
-    return registry
+    return registry, new_mtimes
 
 
 def parse_github_repo(repo_url: str) -> Tuple[str, str] | None:
@@ -203,6 +389,8 @@ def parse_github_repo(repo_url: str) -> Tuple[str, str] | None:
     - https://github.com/owner/repo
     - https://github.com/owner/repo.git
     - https://github.com/owner/repo/xxx
+    - git@github.com:owner/repo.git
+    - github.com/owner/repo
 
     Args:
         repo_url: 仓库地址。
@@ -210,6 +398,12 @@ def parse_github_repo(repo_url: str) -> Tuple[str, str] | None:
     Returns:
         Tuple[str, str] | None: (owner, repo) 元组，解析失败返回 None。
     """
+    # 常见的 GitHub 地址形式固定，先用预编译的正则快速匹配
+    match = _GITHUB_URL_RE.match(repo_url.strip())
+    if match:
+        return match.group(1), match.group(2)
+
+    # 其他形式（如 www.github.com、带端口的地址）回退到 urlparse 解析
     parsed = urlparse(repo_url)
     if "github.com" not in parsed.netloc:
         return None
@@ -220,14 +414,116 @@ def parse_github_repo(repo_url: str) -> Tuple[str, str] | None:
     repo = parts[1]
     if repo.endswith(".git"):
         repo = repo[:-4]
+    if not owner or not repo:
+        return None
     return owner, repo
 
 
-def _fetch_metadata_for_branch(
-    client: httpx.Client,
+def load_branch_cache(cache_path: Path) -> Dict[str, Dict[str, Any]]:
+    """
+    加载仓库分支缓存文件，已超过 BRANCH_CACHE_TTL 的条目会被丢弃。
+
+    Args:
+        cache_path: 缓存文件路径。
+
+    Returns:
+        Dict[str, Dict[str, Any]]: "owner/repo" 到 {"branch", "cached_at"} 的映射，读取失败返回空字典。
+    """
+    if not cache_path.exists():
+        return {}
+    try:
+        with cache_path.open("r", encoding="utf-8") as f:
+            data = json.load(f)
+    except Exception:
+        return {}
+    if not isinstance(data, dict):
+        return {}
+    now = time.time()
+    return {
+        str(repo_key): item
+        for repo_key, item in data.items()
+        if isinstance(item, dict)
+        and isinstance(item.get("branch"), str)
+        and isinstance(item.get("cached_at"), (int, float))
+        and now - item["cached_at"] < BRANCH_CACHE_TTL
+    }
+
+
+def load_etag_cache(cache_path: Path) -> Dict[str, Dict[str, str]]:
+    """
+    加载 ETag 缓存文件。
+
+    Args:
+        cache_path: 缓存文件路径。
+
+    Returns:
+        Dict[str, Dict[str, str]]: URL 到 {"etag", "body"} 的映射，读取失败返回空字典。
+    """
+    if not cache_path.exists():
+        return {}
+    try:
+        with cache_path.open("r", encoding="utf-8") as f:
+            data = json.load(f)
+    except Exception:
+        return {}
+    if not isinstance(data, dict):
+        return {}
+    return {
+        str(url): item
+        for url, item in data.items()
+        if isinstance(item, dict)
+        and isinstance(item.get("etag"), str)
+        and isinstance(item.get("body"), str)
+    }
+
+
+async def _get_with_etag(
+    client: httpx.AsyncClient,
+    url: str,
+    etag_cache: Dict[str, Dict[str, str]],
+    timeout: float = GITHUB_HTTP_TIMEOUT,
+) -> str | None:
+    """
+    发起带 If-None-Match 的条件 GET 请求。
+
+    - 返回 304 时直接使用缓存中的响应体。
+    - 返回 200 时记录新的 ETag 与响应体；响应未携带 ETag 时清除该 URL 的旧缓存。
+    - 其他状态码视为失败，并清除该 URL 的缓存。
+
+    Args:
+        client: HTTP 客户端实例。
+        url: 请求地址。
+        etag_cache: ETag 缓存字典，会被原地更新。
+        timeout: 请求超时时间（秒）。
+
+    Returns:
+        str | None: 响应体文本，失败返回 None。
+    """
+    cached = etag_cache.get(url)
+    headers = {"If-None-Match": cached["etag"]} if cached else None
+    try:
+        resp = await client.get(url, headers=headers, timeout=timeout)
+    except Exception:
+        return None
+    if resp.status_code == 304 and cached:
+        return cached["body"]
+    if resp.status_code != 200:
+        etag_cache.pop(url, None)
+        return None
+    etag = resp.headers.get("ETag")
+    if etag:
+        etag_cache[url] = {"etag": etag, "body": resp.text}
+    else:
+        etag_cache.pop(url, None)
+    return resp.text
+
+
+async def _fetch_metadata_for_branch(
+    client: httpx.AsyncClient,
     owner: str,
     repo: str,
     branch: str,
+    etag_cache: Dict[str, Dict[str, str]],
 ) -> Dict[str, Any] | None:
     """
     从指定分支读取仓库根目录下的 metadata.yaml 文件。
@@ -237,19 +533,17 @@ def _fetch_metadata_for_branch(
         owner: 仓库所有者。
         repo: 仓库名称。
         branch: 分支名称。
+        etag_cache: ETag 缓存字典。
 
     Returns:
         dict | None: 解析后的元数据字典，失败返回 None。
     """
     url = f"{GITHUB_RAW_BASE}/{owner}/{repo}/{branch}/metadata.yaml"
-    try:
-        resp = client.get(url, timeout=15.0)
-    except Exception:
-        return None
-    if resp.status_code != 200:
+    text = await _get_with_etag(client, url, etag_cache, timeout=15.0)
+    if text is None:
         return None
     try:
-        data = yaml.safe_load(resp.text) or {}
+        data = yaml.load(text, Loader=YamlSafeLoader) or {}
     except Exception:
         return None
     if isinstance(data, dict):
@@ -257,110 +551,351 @@ def _fetch_metadata_for_branch(
     return None
 
 
-def fetch_remote_metadata(
-    client: httpx.Client,
+async def fetch_remote_metadata(
+    client: httpx.AsyncClient,
     owner: str,
     repo: str,
+    etag_cache: Dict[str, Dict[str, str]],
+    branch_cache: Dict[str, Dict[str, Any]],
 ) -> Dict[str, Any] | None:
     """
     获取远程仓库中的 metadata.yaml 元数据。
 
-    优先尝试使用 GitHub 仓库的 default_branch，其次回退到 main、master。
+    优先使用分支缓存中记录的分支；未命中或读取失败时，
+    尝试 GitHub 仓库的 default_branch，其次回退到 main、master。
 
     Args:
         client: HTTP 客户端实例。
         owner: 仓库所有者。
         repo: 仓库名称。
+        etag_cache: ETag 缓存字典。
+        branch_cache: 分支缓存字典，成功读取后会记录对应分支。
 
     Returns:
         dict | None: 元数据字典，若无法获取则返回 None。
     """
-    default_branch: str | None = None
-
-    try:
-        api_resp = client.get(f"{GITHUB_API_BASE}/repos/{owner}/{repo}")
-        if api_resp.status_code == 200:
-            repo_info = api_resp.json()
-            default_branch = str(repo_info.get("default_branch", "") or "").strip()
-    except Exception:
-        default_branch = None
-
+    repo_key = f"{owner}/{repo}"
     tried_branches: set[str] = set()
 
-    if default_branch:
-        tried_branches.add(default_branch)
-        data = _fetch_metadata_for_branch(client, owner, repo, default_branch)
+    # 命中分支缓存时直接读取该分支，省去一次 /repos/{owner}/{repo} 请求
+    cached_branch = branch_cache.get(repo_key, {}).get("branch")
+    if cached_branch:
+        tried_branches.add(cached_branch)
+        data = await _fetch_metadata_for_branch(
+            client,
+            owner,
+            repo,
+            cached_branch,
+            etag_cache,
+        )
         if data:
             return data
+        # 缓存的分支已无法读取（如分支被重命名），丢弃缓存后重新探测
+        branch_cache.pop(repo_key, None)
 
-    for branch in ("main", "master"):
+    default_branch: str | None = None
+
+    api_text = await _get_with_etag(
+        client,
+        f"{GITHUB_API_BASE}/repos/{owner}/{repo}",
+        etag_cache,
+    )
+    if api_text is not None:
+        try:
+            repo_info = json.loads(api_text)
+            default_branch = str(repo_info.get("default_branch", "") or "").strip()
+        except Exception:
+            default_branch = None
+
+    candidate_branches = [default_branch] if default_branch else []
+    candidate_branches += ["main", "master"]
+    for branch in candidate_branches:
         if branch in tried_branches:
             continue
-        data = _fetch_metadata_for_branch(client, owner, repo, branch)
+        tried_branches.add(branch)
+        data = await _fetch_metadata_for_branch(
+            client,
+            owner,
+            repo,
+            branch,
+            etag_cache,
+        )
         if data:
+            branch_cache[repo_key] = {"branch": branch, "cached_at": time.time()}
             return data
 
     return None
 
 
-def update_registry_from_github(registry: Dict[str, Dict[str, Any]]) -> None:
+async def fetch_remote_metadata_batch(
+    client: httpx.AsyncClient,
+    repos: list[Tuple[str, str]],
+) -> Dict[Tuple[str, str], Dict[str, Any]]:
+    """
+    通过 GitHub GraphQL API 一次性读取多个仓库默认分支上的 metadata.yaml。
+
+    每个仓库对应查询中的一个别名（repo0、repo1……），
+    使用 HEAD:metadata.yaml 表达式直接读取默认分支上的文件内容。
+    GraphQL 接口要求请求携带令牌。
+
+    Args:
+        client: HTTP 客户端实例。
+        repos: (owner, repo) 元组列表。
+
+    Returns:
+        Dict[Tuple[str, str], Dict[str, Any]]: 成功读取的仓库到元数据字典的映射，
+        未包含在结果中的仓库需要回退到 fetch_remote_metadata。
+    """
+    fields = [
+        f"repo{index}: repository(owner: {json.dumps(owner)}, name: {json.dumps(repo)}) "
+        '{ object(expression: "HEAD:metadata.yaml") { ... on Blob { text } } }'
+        for index, (owner, repo) in enumerate(repos)
+    ]
+    query = "query { " + " ".join(fields) + " }"
+    try:
+        resp = await client.post(GITHUB_GRAPHQL_URL, json={"query": query})
+        payload = resp.json() if resp.status_code == 200 else None
+    except Exception:
+        return {}
+    # 部分仓库不存在时接口仍返回 200，对应别名的值为 null，错误信息位于 errors 字段
+    data = payload.get("data") if isinstance(payload, dict) else None
+    if not isinstance(data, dict):
+        return {}
+
+    result: Dict[Tuple[str, str], Dict[str, Any]] = {}
+    for index, repo_key in enumerate(repos):
+        node = data.get(f"repo{index}")
+        blob = node.get("object") if isinstance(node, dict) else None
+        text = blob.get("text") if isinstance(blob, dict) else None
+        if not text:
+            continue
+        try:
+            metadata = yaml.load(text, Loader=YamlSafeLoader) or {}
+        except Exception:
+            continue
+        if isinstance(metadata, dict) and metadata:
+            result[repo_key] = metadata
+    return result
+
+
+async def update_registry_from_github(
+    registry: Dict[str, PluginEntry],
+    cache_dir: Path,
+) -> None:
     """
     使用 GitHub 仓库中的 metadata.yaml 刷新注册表中的插件元数据。
 
     只处理带有 GitHub 仓库地址的插件：
-    - 解析 repo 字段得到 owner/repo。
-    - 读取远程 metadata.yaml，更新 version/desc/author 等字段。
+    - 解析 repo 字段得到 owner/repo，多个插件指向同一仓库时只请求一次。
+    - 配置了令牌时，先通过 GraphQL 批量读取远程 metadata.yaml；
+      未读取到的仓库再逐个通过 REST 接口与 raw 文件地址获取。
+    - 所有请求并发进行（最多 GITHUB_CONCURRENCY 个请求同时进行），
+      读取结果用于更新 version/desc/author 等字段。
+    - 请求结果按 URL 记录 ETag 并保存在 cache_dir 下，再次运行时仓库未变更则无需重新下载；
+      保存时丢弃不再属于注册表中任何仓库的 URL。
+    - 成功读取 metadata.yaml 的分支同样缓存在 cache_dir 下，
+      有效期内再次运行时无需查询仓库默认分支。
 
     Args:
         registry: 插件注册表字典。
+        cache_dir: ETag 缓存与分支缓存文件所在目录。
     """
     if not registry:
         return
-    client = create_github_client()
-    try:
-        for plugin_name, entry in registry.items():
-            repo_url = str(entry.get("repo", "") or "").strip()
-            if not repo_url:
-                continue
-            parsed = parse_github_repo(repo_url)
-            if not parsed:
-                continue
-            owner, repo = parsed
-            remote_metadata = fetch_remote_metadata(client, owner, repo)
-            if not remote_metadata:
-                continue
-            remote_version = str(remote_metadata.get("version", "") or "").strip()
-            if not remote_version:
-                continue
-            entry["version"] = remote_version
-            remote_desc = remote_metadata.get("desc") or remote_metadata.get(
-                "description",
+
+    targets: list[Tuple[PluginEntry, Tuple[str, str]]] = []
+    for entry in registry.values():
+        repo_url = entry.repo.strip()
+        if not repo_url:
+            continue
+        parsed = parse_github_repo(repo_url)
+        if not parsed:
+            continue
+        targets.append((entry, parsed))
+    if not targets:
+        return
+
+    # 按 (owner, repo) 去重，保持首次出现的顺序
+    unique_repos = list(dict.fromkeys(repo_key for _, repo_key in targets))
+
+    etag_cache_path = cache_dir / ETAG_CACHE_FILE
+    etag_cache = load_etag_cache(etag_cache_path)
+    branch_cache_path = cache_dir / BRANCH_CACHE_FILE
+    branch_cache = load_branch_cache(branch_cache_path)
+    semaphore = asyncio.Semaphore(GITHUB_CONCURRENCY)
+
+    async def _with_limit(coro):
+        async with semaphore:
+            return await coro
+
+    remote_by_repo: Dict[Tuple[str, str], Dict[str, Any] | None] = {}
+    async with create_async_github_client() as client:
+        # GraphQL 接口必须认证，未配置令牌时直接使用 REST 接口
+        if "Authorization" in client.headers:
+            batches = [
+                unique_repos[i : i + GITHUB_GRAPHQL_BATCH_SIZE]
+                for i in range(0, len(unique_repos), GITHUB_GRAPHQL_BATCH_SIZE)
+            ]
+            batch_results = await asyncio.gather(
+                *(
+                    _with_limit(fetch_remote_metadata_batch(client, batch))
+                    for batch in batches
+                ),
             )
-            if remote_desc:
-                entry["desc"] = str(remote_desc)
-            remote_author = remote_metadata.get("author")
-            if remote_author:
-                entry["author"] = str(remote_author)
-    finally:
-        client.close()
+            for batch_result in batch_results:
+                remote_by_repo.update(batch_result)
+
+        # GraphQL 未能读取到 metadata.yaml 的仓库回退到逐个分支探测
+        missing_repos = [key for key in unique_repos if key not in remote_by_repo]
+        results = await asyncio.gather(
+            *(
+                _with_limit(
+                    fetch_remote_metadata(
+                        client,
+                        owner,
+                        repo,
+                        etag_cache,
+                        branch_cache,
+                    ),
+                )
+                for owner, repo in missing_repos
+            ),
+        )
+        remote_by_repo.update(zip(missing_repos, results))
+
+    # 只保留本次注册表中仍引用的仓库对应的缓存，已移除插件的条目不再随运行次数累积
+    repo_api_urls = {
+        f"{GITHUB_API_BASE}/repos/{owner}/{repo}" for owner, repo in unique_repos
+    }
+    repo_raw_prefixes = tuple(
+        f"{GITHUB_RAW_BASE}/{owner}/{repo}/" for owner, repo in unique_repos
+    )
+    etag_cache = {
+        url: item
+        for url, item in etag_cache.items()
+        if url in repo_api_urls or url.startswith(repo_raw_prefixes)
+    }
+    save_json(etag_cache, etag_cache_path)
+    save_json(branch_cache, branch_cache_path)
+
+    for entry, repo_key in targets:
+        remote_metadata = remote_by_repo[repo_key]
+        if not remote_metadata:
+            continue
+        remote_version = str(remote_metadata.get("version", "") or "").strip()
+        if not remote_version:
+            continue
+        entry.version = remote_version
+        remote_desc = remote_metadata.get("desc") or remote_metadata.get(
+            "description",
+        )
+        if remote_desc:
+            entry.desc = str(remote_desc)
+        remote_author = remote_metadata.get("author")
+        if remote_author:
+            entry.author = str(remote_author)
 
 
 def save_json(data: Any, output_path: Path) -> None:
     """
     将任意数据以 JSON 格式保存到指定路径。
 
-    会自动创建父目录，并使用 UTF-8 编码写入文件。
+    使用 UTF-8 编码，经 write_bytes_atomic 原子写入，
+    避免脚本中途退出时留下不完整的文件。父目录需由调用方提前创建。
 
     Args:
         data: 任意可 JSON 序列化的数据。
         output_path: 输出文件路径。
     """
-    # 确保输出目录存在
-    output_path.parent.mkdir(parents=True, exist_ok=True)
+    # 为了便于人工查看，这里使用缩进格式
+    payload = json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+    write_bytes_atomic(payload, output_path)
+
+
+def serialize_registry(registry: Dict[str, Dict[str, Any]]) -> bytes:
+    """
+    将注册表序列化为按键排序的紧凑 JSON（UTF-8 字节）。
+
+    返回的字节既是 MD5 摘要的输入，也是写入注册表文件的内容，
+    内容相同时文件与摘要保持一致，且每次运行只需序列化一次。
+    已安装 orjson 时使用 orjson，否则使用标准库 json。
+
+    Args:
+        registry: 插件注册表字典。
+
+    Returns:
+        bytes: 注册表 JSON 的 UTF-8 编码。
+    """
+    if orjson is not None:
+        return orjson.dumps(registry, option=orjson.OPT_SORT_KEYS)
+    return json.dumps(
+        registry,
+        ensure_ascii=False,
+        sort_keys=True,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def write_bytes_atomic(payload: bytes, output_path: Path) -> None:
+    """
+    将字节内容原子写入指定路径。
+
+    先写入同目录下的临时文件（目标文件名后追加 .tmp）并落盘，再通过 os.replace 原子替换目标文件，
+    前端不会读取到写了一半的文件；写入失败时删除临时文件后重新抛出异常。
+    父目录需由调用方提前创建。
+
+    Args:
+        payload: 待写入的字节内容。
+        output_path: 输出文件路径。
+    """
+    tmp_path = output_path.with_suffix(output_path.suffix + ".tmp")
+    try:
+        with tmp_path.open("wb") as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def save_registry_gzip(registry_path: Path, gzip_output_path: Path) -> None:
+    """
+    将已写出的注册表文件压缩为 gzip 文件。
 
-    with output_path.open("w", encoding="utf-8") as f:
-        # 为了便于人工查看，这里使用缩进格式
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    直接压缩文件内容，无需再次序列化注册表；压缩结果经 write_bytes_atomic 原子写入，
+    不会留下不完整的 .gz 文件。
+
+    Args:
+        registry_path: 注册表 JSON 文件路径。
+        gzip_output_path: gzip 文件输出路径。
+    """
+    payload = gzip.compress(registry_path.read_bytes(), compresslevel=6)
+    write_bytes_atomic(payload, gzip_output_path)
+
+
+def load_registry_md5(md5_path: Path) -> str | None:
+    """
+    读取上次生成的注册表 MD5 文件中的摘要。
+
+    Args:
+        md5_path: MD5 文件路径。
+
+    Returns:
+        str | None: MD5 摘要，文件不存在或格式不正确时返回 None。
+    """
+    if not md5_path.exists():
+        return None
+    try:
+        with md5_path.open("r", encoding="utf-8") as f:
+            data = json.load(f)
+    except Exception:
+        return None
+    if not isinstance(data, dict):
+        return None
+    md5 = data.get("md5")
+    return md5 if isinstance(md5, str) else None
 
 
 def load_existing_registry(output_path: Path) -> Dict[str, Dict[str, Any]]:
@@ -388,31 +923,23 @@ def diff_registries(
     Dict[str, Dict[str, Any]],
     Dict[str, Dict[str, Tuple[Any, Any]]],
 ]:
-    added: Dict[str, Dict[str, Any]] = {}
-    removed: Dict[str, Dict[str, Any]] = {}
+    # 借助字典视图的集合运算得到新增、移除与共有的插件名，排序以保证输出稳定
+    added = {name: new[name] for name in sorted(new.keys() - old.keys())}
+    removed = {name: old[name] for name in sorted(old.keys() - new.keys())}
     updated: Dict[str, Dict[str, Tuple[Any, Any]]] = {}
 
-    for name, entry in new.items():
-        if name not in old:
-            added[name] = entry
-            continue
+    for name in sorted(new.keys() & old.keys()):
         old_entry = old[name]
-        if old_entry == entry:
-            continue
-        field_changes: Dict[str, Tuple[Any, Any]] = {}
-        keys = set(old_entry.keys()) | set(entry.keys())
-        for key in keys:
-            old_value = old_entry.get(key)
-            new_value = entry.get(key)
-            if old_value != new_value:
-                field_changes[key] = (old_value, new_value)
+        entry = new[name]
+        # 单次遍历所有字段，只收集取值不同的字段
+        field_changes = {
+            key: (old_entry.get(key), entry.get(key))
+            for key in old_entry.keys() | entry.keys()
+            if old_entry.get(key) != entry.get(key)
+        }
         if field_changes:
             updated[name] = field_changes
 
-    for name, entry in old.items():
-        if name not in new:
-            removed[name] = entry
-
     return added, removed, updated
 
 
@@ -423,8 +950,7 @@ def parse_args() -> argparse.Namespace:
     支持：
     - --plugin-dir：插件目录，默认使用 AstrBot 的 data/plugins。
     - --output：注册表 JSON 输出路径，默认 plugins_custom.json。
-
-
+    - --gzip：额外生成 gzip 压缩的注册表文件。
 
     Returns:
         argparse.Namespace: 解析后的参数对象。
@@ -444,6 +970,11 @@ def parse_args() -> argparse.Namespace:
         default=DEFAULT_REGISTRY_OUTPUT,
         help="插件注册表 JSON 输出路径，默认为 ./plugins_custom.json。",
     )
+    parser.add_argument(
+        "--gzip",
+        action="store_true",
+        help="额外生成 gzip 压缩的注册表文件（输出路径后追加 .gz），注册表未变化时仅在压缩文件缺失时生成。",
+    )
     return parser.parse_args()
 
 
@@ -476,30 +1007,72 @@ def main() -> None:
     步骤：
     1. 解析命令行参数，确定插件目录与输出路径。
     2. 收集插件元数据，生成注册表字典。
-    3. 将注册表写入 JSON 文件。
-    4. 在控制台打印简单的执行结果，方便确认。
+    3. 计算注册表 MD5，与上次生成的 MD5 一致时直接结束。
+    4. 否则对比新旧注册表，并将注册表及其 MD5 摘要写入 JSON 文件。
+    5. 在控制台打印简单的执行结果，方便确认。
     """
     args = parse_args()
 
     plugin_dir = resolve_plugin_dir(args.plugin_dir)
     output_path = Path(args.output).expanduser().resolve()
+    # 与 AstrBot 读取自定义插件源 MD5 的地址规则保持一致：xxx.json -> xxx-md5.json
+    md5_output_path = output_path.with_name(f"{output_path.stem}-md5.json")
 
     print(f"使用插件目录: {plugin_dir}")
     print(f"注册表输出文件: {output_path}")
+    print(f"MD5 输出文件: {md5_output_path}")
+
+    # 注册表、MD5 文件及各类缓存文件均写入该目录，统一在此创建
+    output_path.parent.mkdir(parents=True, exist_ok=True)
 
     existing_registry = load_existing_registry(output_path)
+    mtime_cache_path = output_path.parent / MTIME_CACHE_FILE
 
-    registry = collect_installed_plugins(plugin_dir)
+    registry, new_mtimes = collect_installed_plugins(
+        plugin_dir,
+        previous=existing_registry,
+        mtimes=load_mtime_cache(mtime_cache_path),
+    )
 
     if not registry:
         print("警告：未在指定目录中发现有效的插件元数据，未生成任何条目。")
 
-    update_registry_from_github(registry)
+    asyncio.run(update_registry_from_github(registry, output_path.parent))
+
+    # 转换为普通字典，供差异对比与序列化共用
+    registry_data = {name: asdict(entry) for name, entry in registry.items()}
+
+    # 只序列化一次：同一份字节既用于计算 MD5，也直接写入注册表文件
+    registry_payload = serialize_registry(registry_data)
+    # 摘要仅用于判断内容是否变化，不涉及安全用途
+    registry_md5 = hashlib.md5(registry_payload, usedforsecurity=False).hexdigest()
+
+    gzip_output_path = output_path.with_name(output_path.name + ".gz")
+
+    # MD5 与上次生成的结果一致说明注册表内容未变化，跳过逐条差异对比与重新写入
+    if output_path.exists() and load_registry_md5(md5_output_path) == registry_md5:
+        print(f"注册表 MD5 未变化（{registry_md5}），未检测到插件变更，无需重新写入。")
+        # 首次指定 --gzip 或压缩文件被删除时，仍需根据现有注册表补充生成
+        if args.gzip and not gzip_output_path.exists():
+            save_registry_gzip(output_path, gzip_output_path)
+            print(f"已生成 gzip 压缩的注册表: {gzip_output_path}")
+        save_json(new_mtimes, mtime_cache_path)
+        return
+
+    added, removed, updated = diff_registries(existing_registry, registry_data)
+
+    write_bytes_atomic(registry_payload, output_path)
+    print(f"已生成插件注册表 JSON，包含 {len(registry_data)} 个插件。")
+
+    if args.gzip:
+        save_registry_gzip(output_path, gzip_output_path)
+        print(f"已生成 gzip 压缩的注册表: {gzip_output_path}")
 
-    added, removed, updated = diff_registries(existing_registry, registry)
+    save_json({"md5": registry_md5}, md5_output_path)
+    print(f"已生成注册表 MD5 文件: {registry_md5}")
 
-    save_json(registry, output_path)
-    print(f"已生成插件注册表 JSON，包含 {len(registry)} 个插件。")
+    # 修改时间缓存只在注册表与 MD5 文件写入完成后保存，以免复用未写入的条目
+    save_json(new_mtimes, mtime_cache_path)
 
     if not existing_registry:
         print("未检测到已有注册表文件，视为首次生成。")